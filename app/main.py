@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from .config import Settings, get_settings
+from .config import get_settings
 from .models import GeocodeResult, ModelRequest, PreviewResponse
 from .services.geocoding import GeocodingError, search_address
 from .services.mesher import (
@@ -16,9 +19,34 @@ from .services.mesher import (
 )
 from .services.overpass import OverpassError, fetch_environment
 
+SETTINGS = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI):
+    fastapi_app.state.http = httpx.AsyncClient(
+        headers={"User-Agent": SETTINGS.user_agent},
+        timeout=SETTINGS.overpass_timeout,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=16,
+            max_keepalive_connections=8,
+            keepalive_expiry=60,
+        ),
+    )
+    try:
+        yield
+    finally:
+        await fastapi_app.state.http.aclose()
+
 
 def get_app() -> FastAPI:
-    fastapi_app = FastAPI(title="print3dhood", version="0.1.0")
+    fastapi_app = FastAPI(
+        title="print3dhood",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
     fastapi_app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -40,14 +68,24 @@ async def root(request: Request):
 
 
 @app.get("/api/health")
-async def health(settings: Settings = Depends(get_settings)):
-    return {"status": "ok", "service": settings.app_name}
+async def health():
+    return {"status": "ok", "service": SETTINGS.app_name}
 
 
 @app.get("/api/geocode")
-async def geocode(query: str) -> dict[str, list[GeocodeResult]]:
+async def geocode(
+    request: Request,
+    query: str = Query(...),
+) -> dict[str, list[GeocodeResult]]:
+    # Validate the trimmed text, as the search form does, so " a" is rejected.
+    query = query.strip()
+    if not 2 <= len(query) <= 200:
+        raise HTTPException(
+            status_code=422,
+            detail="Search text must be between 2 and 200 characters.",
+        )
     try:
-        results = await search_address(query)
+        results = await search_address(query, client=request.app.state.http)
     except GeocodingError as exc:
         raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
     if not results:
@@ -56,16 +94,17 @@ async def geocode(query: str) -> dict[str, list[GeocodeResult]]:
 
 
 @app.post("/api/models")
-async def create_models(request: ModelRequest, settings: Settings = Depends(get_settings)):
-    request = request.model_copy(update={"highlight_home": True, "formats": ["stl"]})
-    if request.radius_meters > settings.max_radius_m:
-        request = request.model_copy(update={"radius_meters": settings.max_radius_m})
+async def create_models(request: ModelRequest, http_request: Request):
+    request.highlight_home = True
+    request.formats = ["stl"]
+    request.radius_meters = min(request.radius_meters, SETTINGS.max_radius_m)
 
     try:
         buildings, roads, parks, waters = await fetch_environment(
             latitude=request.latitude,
             longitude=request.longitude,
             radius_m=request.radius_meters,
+            client=http_request.app.state.http,
         )
     except OverpassError as exc:
         raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
@@ -93,15 +132,17 @@ async def create_models(request: ModelRequest, settings: Settings = Depends(get_
     return StreamingResponse(content=archive, media_type="application/zip", headers=headers)
 
 
-@app.post("/api/models/preview")
-async def preview_models(request: ModelRequest) -> PreviewResponse:
-    request = request.model_copy(update={"highlight_home": True, "formats": ["stl"]})
+@app.post("/api/models/preview", response_model=PreviewResponse)
+async def preview_models(request: ModelRequest, http_request: Request) -> Response:
+    request.highlight_home = True
+    request.formats = ["stl"]
 
     try:
         buildings, roads, parks, waters = await fetch_environment(
             latitude=request.latitude,
             longitude=request.longitude,
             radius_m=request.radius_meters,
+            client=http_request.app.state.http,
         )
     except OverpassError as exc:
         raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
@@ -118,7 +159,8 @@ async def preview_models(request: ModelRequest) -> PreviewResponse:
         parks=parks,
         waters=waters,
     )
-    return PreviewResponse(metadata=metadata, previews=previews)
+    response = PreviewResponse(metadata=metadata, previews=previews)
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @app.exception_handler(ModelBuildError)
@@ -1,22 +1,33 @@
 from typing import List, Sequence
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .config import get_settings
 
+_SETTINGS = get_settings()
+_ALLOWED_FORMATS = _SETTINGS.allowed_formats
+_MAX_FORMATS = _SETTINGS.max_formats
+
 
 class LayerInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     thickness_m: float
     description: str
 
 
 class PolygonPath(BaseModel):
-    outer: List[tuple[float, float]]
-    holes: List[List[tuple[float, float]]] = []
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    # Rings are flattened as [x0, y0, x1, y1, ...] in normalized preview space.
+    outer: List[float]
+    holes: List[List[float]] = []
 
 
 class LayerPreview(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     thickness_m: float
     base_color: str
@@ -29,12 +40,16 @@ class LayerPreview(BaseModel):
 
 
 class GeocodeResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     display_name: str
     latitude: float
     longitude: float
 
 
 class BuildingSummary(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     osm_id: int
     height_m: float
     footprint_area_m2: float
@@ -53,6 +68,9 @@ class ModelMetadata(BaseModel):
 
 
 class ModelRequest(BaseModel):
+    # Left mutable: handlers override a few fields in place after validation.
+    model_config = ConfigDict(validate_assignment=False)
+
     latitude: float = Field(..., ge=-90.0, le=90.0)
     longitude: float = Field(..., ge=-180.0, le=180.0)
     radius_meters: int = Field(..., gt=10, lt=2000)
@@ -62,21 +80,23 @@ class ModelRequest(BaseModel):
     @field_validator("formats")
     @classmethod
     def validate_formats(cls, value: Sequence[str]) -> List[str]:
-        settings = get_settings()
+        allowed = _ALLOWED_FORMATS
+        if len(value) == 1 and value[0] in allowed:
+            return [value[0]]
         normalized = []
         for fmt in value:
             fmt_lower = fmt.lower()
-            if fmt_lower not in settings.allowed_formats:
+            if fmt_lower not in allowed:
                 raise ValueError(
-                    f"Unsupported format '{fmt}'. Choose from {settings.allowed_formats}"
+                    f"Unsupported format '{fmt}'. Choose from {allowed}"
                 )
             if fmt_lower not in normalized:
                 normalized.append(fmt_lower)
         if not normalized:
-            normalized.append(settings.allowed_formats[0])
-        if len(normalized) > settings.max_formats:
+            normalized.append(allowed[0])
+        if len(normalized) > _MAX_FORMATS:
             raise ValueError(
-                f"Select at most {settings.max_formats} formats per request."
+                f"Select at most {_MAX_FORMATS} formats per request."
             )
         return normalized
 
@@ -1,43 +1,90 @@
 from __future__ import annotations
 
-import httpx
-
-from dataclasses import dataclass
+import asyncio
+import time
+from collections import OrderedDict
+from functools import partial
 
 import httpx
+import orjson
+from pydantic import TypeAdapter, ValidationError
 
 from ..config import get_settings
 from ..models import GeocodeResult
 
 
-@dataclass
 class GeocodingError(Exception):
-    message: str
-    status_code: int = 503
+    __slots__ = ("message", "status_code")
+
+    def __init__(self, message: str, status_code: int = 503) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+_SETTINGS = get_settings()
+_RESULTS_ADAPTER = TypeAdapter(list[GeocodeResult])
+_BASE_PARAMS = {"format": "jsonv2", "addressdetails": 1}
+
+_cache: OrderedDict[tuple[str, int], tuple[float, list[GeocodeResult]]] = OrderedDict()
+_inflight: dict[tuple[str, int], asyncio.Task[list[GeocodeResult]]] = {}
+
+
+def clear_cache() -> None:
+    _cache.clear()
+    _inflight.clear()
 
-    def __str__(self) -> str:  # pragma: no cover - simple helper
-        return self.message
 
+async def search_address(
+    query: str, limit: int = 5, *, client: httpx.AsyncClient
+) -> list[GeocodeResult]:
+    key = (query.strip().lower(), limit)
+    cached = _cache.get(key)
+    if cached is not None:
+        expires_at, results = cached
+        if expires_at > time.monotonic():
+            _cache.move_to_end(key)
+            return results
+        del _cache[key]
 
-async def search_address(query: str, limit: int = 5) -> list[GeocodeResult]:
-    if not query.strip():
-        return []
+    # Concurrent misses for the same key share one upstream request.
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache(key, query, limit, client=client))
+        _inflight[key] = task
+        task.add_done_callback(partial(_forget_inflight, key))
+    return await asyncio.shield(task)
 
-    settings = get_settings()
-    params = {
-        "q": query,
-        "format": "jsonv2",
-        "addressdetails": 1,
-        "limit": limit,
-    }
+
+def _forget_inflight(
+    key: tuple[str, int], task: asyncio.Task[list[GeocodeResult]]
+) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Retrieve the outcome so a failure nobody awaited (every waiter was
+    # cancelled) is not reported as "Task exception was never retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_and_cache(
+    key: tuple[str, int], query: str, limit: int, *, client: httpx.AsyncClient
+) -> list[GeocodeResult]:
+    results = await _fetch_results(query, limit, client=client)
+    _cache[key] = (time.monotonic() + _SETTINGS.geocode_cache_ttl_s, results)
+    while len(_cache) > _SETTINGS.geocode_cache_size:
+        _cache.popitem(last=False)
+    return results
+
+
+async def _fetch_results(
+    query: str, limit: int, *, client: httpx.AsyncClient
+) -> list[GeocodeResult]:
+    params = {**_BASE_PARAMS, "q": query, "limit": limit}
 
     try:
-        async with httpx.AsyncClient(
-            headers={"User-Agent": settings.user_agent},
-            timeout=settings.overpass_timeout,
-        ) as client:
-            response = await client.get(settings.nominatim_url, params=params)
-            response.raise_for_status()
+        response = await client.get(_SETTINGS.nominatim_url, params=params)
+        response.raise_for_status()
     except httpx.HTTPStatusError as exc:  # pragma: no cover - thin wrapper
         status = exc.response.status_code
         if status == 403:
@@ -56,17 +103,24 @@ async def search_address(query: str, limit: int = 5) -> list[GeocodeResult]:
     except httpx.RequestError as exc:  # pragma: no cover
         raise GeocodingError("Unable to reach the geocoding service.") from exc
 
-    payload = response.json()
-    results: list[GeocodeResult] = []
-    for item in payload:
-        try:
-            results.append(
-                GeocodeResult(
-                    display_name=item.get("display_name", "Unknown location"),
-                    latitude=float(item["lat"]),
-                    longitude=float(item["lon"]),
-                )
-            )
-        except (KeyError, ValueError):
-            continue
-    return results
+    payload = orjson.loads(response.content)
+    candidates = [
+        {
+            "display_name": item.get("display_name", "Unknown location"),
+            "latitude": item["lat"],
+            "longitude": item["lon"],
+        }
+        for item in payload
+        if "lat" in item and "lon" in item
+    ]
+    try:
+        return _RESULTS_ADAPTER.validate_python(candidates)
+    except ValidationError:
+        # Drop only the malformed entries rather than failing the whole lookup.
+        results: list[GeocodeResult] = []
+        for candidate in candidates:
+            try:
+                results.append(GeocodeResult.model_validate(candidate))
+            except ValidationError:
+                continue
+        return results
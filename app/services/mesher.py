@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from io import BytesIO
-from typing import Iterable
-import zipfile
+from typing import Iterator
 
-import shapely.affinity as affinity
+import mapbox_earcut as earcut
+import numpy as np
+import orjson
+import shapely
 from shapely.geometry import GeometryCollection, MultiPolygon, Point, Polygon
-from shapely.ops import unary_union
+from shapely.geometry.polygon import orient
+from shapely.strtree import STRtree
 import trimesh
 
 from ..config import get_settings
@@ -20,6 +24,7 @@ from ..models import (
     ModelRequest,
     PolygonPath,
 )
+from ..utils.zipstream import ZipStreamWriter, compress_entry
 from .overpass import (
     BuildingFootprint,
     ParkFeature,
@@ -29,6 +34,13 @@ from .overpass import (
 )
 
 
+_CLIP_CIRCLE_RESOLUTION = 96
+# 48 segments per quadrant deviates from the default 200 mm disk by ~13 µm, well
+# under printer resolution.
+_BASE_CIRCLE_RESOLUTION = 48
+_POLYGON_TYPE_ID = 3
+
+
 class ModelBuildError(RuntimeError):
     """Raised when a mesh cannot be produced."""
 
@@ -64,7 +76,7 @@ def build_model_archive(
     roads: list[RoadFeature],
     parks: list[ParkFeature],
     waters: list[WaterFeature],
-) -> tuple[str, BytesIO, ModelMetadata]:
+) -> tuple[str, Iterator[bytes], ModelMetadata]:
     if not buildings:
         raise ModelBuildError("No buildings were found for the requested area.")
 
@@ -100,9 +112,6 @@ def build_model_archive(
         building_base=prepared.building_base,
         road_union=prepared.road_union,
         building_mesh_data=prepared.building_mesh_data,
-        home_polygons=prepared.home_polygons
-        if request.highlight_home and prepared.home_polygons
-        else [],
         settings=settings,
     )
     layer_meshes["building_layer"] = building_mesh
@@ -134,22 +143,15 @@ def build_model_archive(
         buildings=prepared.building_summaries,
     )
 
-    mesh_buffer = BytesIO()
-    with zipfile.ZipFile(mesh_buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for fmt in request.formats:
-            for layer_name, mesh in layer_meshes.items():
-                archive.writestr(
-                    f"layers/{layer_name}.{fmt}",
-                    _export_mesh(mesh, fmt),
-                )
-        archive.writestr(
-            "metadata.json",
-            json.dumps(metadata.model_dump(), indent=2),
-        )
-
-    mesh_buffer.seek(0)
     filename = f"print3dhood_{int(request.radius_meters)}m_layers.zip"
-    return filename, mesh_buffer, metadata
+    metadata_json = orjson.dumps(metadata.model_dump(), option=orjson.OPT_INDENT_2)
+    archive = _stream_archive(
+        formats=request.formats,
+        layer_meshes=layer_meshes,
+        metadata_json=metadata_json,
+        compression_level=settings.zip_compression_level,
+    )
+    return filename, archive, metadata
 
 
 def generate_preview_data(
@@ -205,9 +207,9 @@ def _build_scene_context(
     )
 
     circle_world = Point(origin_x, origin_y).buffer(
-        float(request.radius_meters), resolution=96
+        float(request.radius_meters), resolution=_CLIP_CIRCLE_RESOLUTION
     )
-    base_circle = Point(0, 0).buffer(print_radius, resolution=128)
+    base_circle = Point(0, 0).buffer(print_radius, quad_segs=_BASE_CIRCLE_RESOLUTION)
     home_point = Point(request.longitude, request.latitude)
     home_building = _identify_home_building(buildings, home_point)
 
@@ -222,6 +224,7 @@ def _build_scene_context(
         origin_y=origin_y,
         scale_factor=scale_factor,
         home_building=home_building,
+        cut_home=request.highlight_home,
         settings=settings,
     )
 
@@ -247,16 +250,18 @@ def _prepare_geometries(
     origin_y: float,
     scale_factor: float,
     home_building: BuildingFootprint | None,
+    cut_home: bool,
     settings,
 ) -> PreparedGeometries:
     building_mesh_data: list[tuple[list[Polygon], float]] = []
-    building_polygons_all: list[Polygon] = []
     building_summaries: list[BuildingSummary] = []
     home_polygons: list[Polygon] = []
     home_height: float | None = None
 
     for footprint in buildings:
-        clipped = footprint.polygon_projected.intersection(circle_world)
+        clipped = _clip_to_world_circle(
+            footprint.polygon_projected, circle_world, origin_x, origin_y
+        )
         if clipped.is_empty:
             continue
         local = _to_local_scaled(clipped, origin_x, origin_y, scale_factor)
@@ -265,7 +270,7 @@ def _prepare_geometries(
             continue
         scaled_height = max(footprint.height_m * scale_factor, 0.0005)
         building_summaries.append(
-            BuildingSummary(
+            BuildingSummary.model_construct(
                 osm_id=footprint.osm_id,
                 height_m=footprint.height_m,
                 footprint_area_m2=footprint.area_m2,
@@ -277,53 +282,58 @@ def _prepare_geometries(
             home_height = scaled_height
         else:
             building_mesh_data.append((polygons, scaled_height))
-        building_polygons_all.extend(polygons)
 
-    if not building_polygons_all and not home_polygons:
+    if not building_mesh_data and not home_polygons:
         raise ModelBuildError("Unable to construct scaled footprints for this area.")
 
-    park_polygons: list[Polygon] = []
     park_shrink = max(settings.park_indent_shrink_m * scale_factor, 0.0)
-    for feature in parks:
-        local = _to_local_scaled(feature.polygon_projected, origin_x, origin_y, scale_factor)
-        for polygon in _iter_polygons(local):
-            if park_shrink > 0:
-                shrunken = polygon.buffer(-park_shrink)
-                for shp in _iter_polygons(shrunken):
-                    park_polygons.append(shp)
-            else:
-                park_polygons.append(polygon)
-    water_polygons = [
-        poly
-        for feature in waters
-        for poly in _iter_polygons(
-            _to_local_scaled(feature.polygon_projected, origin_x, origin_y, scale_factor)
+    park_polygons = _polygon_parts(
+        _to_local_scaled(
+            [feature.polygon_projected for feature in parks],
+            origin_x,
+            origin_y,
+            scale_factor,
         )
-    ]
-    road_buffers = []
+    )
+    if park_shrink > 0:
+        park_polygons = _polygon_parts(shapely.buffer(park_polygons, -park_shrink))
+    water_polygons = _polygon_parts(
+        _to_local_scaled(
+            [feature.polygon_projected for feature in waters],
+            origin_x,
+            origin_y,
+            scale_factor,
+        )
+    )
     road_width = max(settings.road_indent_width_m * scale_factor, 0.001)
-    for road in roads:
-        local_line = _to_local_scaled(road.line_projected, origin_x, origin_y, scale_factor)
-        buffered = local_line.buffer(road_width, cap_style=2, join_style=2)
-        if not buffered.is_empty:
-            road_buffers.extend(_iter_polygons(buffered))
-
-    building_union = _clip_to_circle(
-        _union_geometries(building_polygons_all + home_polygons), base_circle
+    road_lines = _to_local_scaled(
+        [road.line_projected for road in roads], origin_x, origin_y, scale_factor
+    )
+    # Vertices closer together than a fraction of the groove width are invisible
+    # once buffered, so thin them out before buffering and unioning.
+    road_lines = shapely.simplify(road_lines, road_width * 0.25, preserve_topology=False)
+    road_buffers = _polygon_parts(
+        shapely.buffer(road_lines, road_width, cap_style="flat", join_style="mitre")
     )
+
+    # Prepared once so the containment fast path in _clip_to_circle is cheap.
+    shapely.prepare(base_circle)
     water_union = _clip_to_circle(_union_geometries(water_polygons), base_circle)
     land_no_water = base_circle
     if not getattr(water_union, "is_empty", True):
         land_no_water = base_circle.difference(water_union)
     if getattr(land_no_water, "is_empty", True):
         land_no_water = base_circle
+    shapely.prepare(land_no_water)
 
     parks_union = _clip_to_circle(_union_geometries(park_polygons), land_no_water)
     road_union = _clip_to_circle(_union_geometries(road_buffers), base_circle)
 
+    # Park cut-outs and the home cavity come out of the street disk in one overlay.
+    cutout = _union_geometries([parks_union, *(home_polygons if cut_home else [])])
     building_base = land_no_water
-    if not getattr(parks_union, "is_empty", True):
-        building_base = building_base.difference(parks_union)
+    if not getattr(cutout, "is_empty", True):
+        building_base = building_base.difference(cutout)
     if getattr(building_base, "is_empty", True):
         building_base = land_no_water
 
@@ -348,18 +358,14 @@ def _build_water_layer(
     settings,
 ) -> trimesh.Trimesh:
     base_height = settings.base_thickness_m
-    meshes: list[trimesh.Trimesh] = [
-        _extrude_polygon(base_circle, base_height),
-    ]
+    jobs: list[tuple[Polygon, float, float]] = [(base_circle, base_height, 0.0)]
 
     if not getattr(water_union, "is_empty", True):
         water_height = settings.base_thickness_m * 2
         for polygon in _iter_polygons(water_union):
-            column = _extrude_polygon(polygon, water_height)
-            column.apply_translation((0, 0, base_height))
-            meshes.append(column)
+            jobs.append((polygon, water_height, base_height))
 
-    return _combine_meshes(meshes)
+    return _combine_meshes(_extrude_polygons(jobs))
 
 
 def _build_green_layer(
@@ -372,17 +378,15 @@ def _build_green_layer(
     if getattr(land_geom, "is_empty", True):
         raise ModelBuildError("No geometry available for the green layer.")
 
-    meshes: list[trimesh.Trimesh] = []
-    for polygon in _iter_polygons(land_geom):
-        meshes.append(_extrude_polygon(polygon, base_height))
+    jobs: list[tuple[Polygon, float, float]] = [
+        (polygon, base_height, 0.0) for polygon in _iter_polygons(land_geom)
+    ]
 
     if not getattr(park_union, "is_empty", True):
         for polygon in _iter_polygons(park_union):
-            extrusion = _extrude_polygon(polygon, settings.green_layer_thickness_m)
-            extrusion.apply_translation((0, 0, base_height))
-            meshes.append(extrusion)
+            jobs.append((polygon, settings.green_layer_thickness_m, base_height))
 
-    return _combine_meshes(meshes)
+    return _combine_meshes(_extrude_polygons(jobs))
 
 
 def _build_layer_info(settings: Settings, include_highlight: bool) -> list[LayerInfo]:
@@ -484,21 +488,20 @@ def _geometry_to_paths(
         return []
     paths: list[PolygonPath] = []
     for polygon in _iter_polygons(geometry):
-        outer = [_normalize_point(x, y, radius) for x, y in polygon.exterior.coords]
-        holes = [
-            [_normalize_point(x, y, radius) for x, y in interior.coords]
-            for interior in polygon.interiors
-        ]
+        outer = _normalize_ring(polygon.exterior, radius)
+        holes = [_normalize_ring(interior, radius) for interior in polygon.interiors]
         paths.append(PolygonPath(outer=outer, holes=holes))
     return paths
 
 
-def _normalize_point(x: float, y: float, radius: float) -> tuple[float, float]:
+def _normalize_ring(ring, radius: float) -> list[float]:
+    coords = shapely.get_coordinates(ring)
     if radius == 0:
-        return (0.0, 0.0)
-    nx = (x + radius) / (2 * radius)
-    ny = 1 - ((y + radius) / (2 * radius))
-    return (nx, ny)
+        return [0.0] * coords.size
+    normalized = np.empty_like(coords)
+    normalized[:, 0] = (coords[:, 0] + radius) / (2 * radius)
+    normalized[:, 1] = 1 - ((coords[:, 1] + radius) / (2 * radius))
+    return normalized.ravel().tolist()
 
 
 def _build_building_layer(
@@ -506,15 +509,12 @@ def _build_building_layer(
     building_base: Polygon | MultiPolygon | GeometryCollection,
     road_union: Polygon | MultiPolygon | GeometryCollection,
     building_mesh_data: list[tuple[list[Polygon], float]],
-    home_polygons: list[Polygon],
     settings,
 ) -> trimesh.Trimesh:
     if getattr(building_base, "is_empty", True):
         raise ModelBuildError("No geometry available for the building layer.")
 
     base_geom = building_base
-    if home_polygons:
-        base_geom = base_geom.difference(_union_geometries(home_polygons))
 
     road_indent = min(
         settings.road_groove_depth_m,
@@ -523,28 +523,24 @@ def _build_building_layer(
     base_height = settings.building_layer_thickness_m
     slab_height = max(base_height - road_indent, 0.0005)
 
-    meshes: list[trimesh.Trimesh] = []
-    for polygon in _iter_polygons(base_geom):
-        meshes.append(_extrude_polygon(polygon, slab_height))
+    jobs: list[tuple[Polygon, float, float]] = [
+        (polygon, slab_height, 0.0) for polygon in _iter_polygons(base_geom)
+    ]
 
     if road_indent > 0:
         top_geom = base_geom
         if not getattr(road_union, "is_empty", True):
             top_geom = top_geom.difference(road_union)
         for polygon in _iter_polygons(top_geom):
-            road_mesh = _extrude_polygon(polygon, road_indent)
-            road_mesh.apply_translation((0, 0, slab_height))
-            meshes.append(road_mesh)
+            jobs.append((polygon, road_indent, slab_height))
 
     for polygons, height in building_mesh_data:
         for polygon in polygons:
             if polygon.is_empty or polygon.area == 0:
                 continue
-            mesh = _extrude_polygon(polygon, height)
-            mesh.apply_translation((0, 0, base_height))
-            meshes.append(mesh)
+            jobs.append((polygon, height, base_height))
 
-    return _combine_meshes(meshes)
+    return _combine_meshes(_extrude_polygons(jobs))
 
 
 def _build_highlight_layer(
@@ -558,10 +554,12 @@ def _build_highlight_layer(
     for polygon in polygons:
         if polygon.is_empty:
             continue
+        # Peg and body share a footprint, so triangulate it once.
+        triangulation = _triangulate_polygon(polygon)
         if peg_depth > 0:
-            peg = _extrude_polygon(polygon, peg_depth)
+            peg = _extrude_triangulation(triangulation, peg_depth)
             meshes.append(peg)
-        body = _extrude_polygon(polygon, building_height)
+        body = _extrude_triangulation(triangulation, building_height)
         body.apply_translation((0, 0, peg_depth))
         meshes.append(body)
 
@@ -571,15 +569,40 @@ def _build_highlight_layer(
 def _to_local_scaled(
     geometry, origin_x: float, origin_y: float, scale_factor: float
 ):
-    local = affinity.translate(geometry, xoff=-origin_x, yoff=-origin_y)
-    return affinity.scale(local, xfact=scale_factor, yfact=scale_factor, origin=(0, 0))
+    origin = np.array([origin_x, origin_y])
+    return shapely.transform(geometry, lambda coords: (coords - origin) * scale_factor)
 
 
 def _union_geometries(geometries: list[Polygon]) -> Polygon | MultiPolygon | GeometryCollection:
     valid = [geom for geom in geometries if geom and not geom.is_empty]
     if not valid:
         return GeometryCollection()
-    return unary_union(valid)
+    return shapely.union_all(valid)
+
+
+def _clip_to_world_circle(
+    polygon: Polygon, circle: Polygon, center_x: float, center_y: float
+) -> Polygon | MultiPolygon | GeometryCollection:
+    # Cheap checks settle most footprints without a GEOS overlay: boxes outside
+    # the circle's envelope are dropped, and footprints whose bbox (or, failing
+    # that, every vertex) lies within the circle polygon's inscribed radius
+    # pass through untouched.
+    minx, miny, maxx, maxy = polygon.bounds
+    circle_minx, circle_miny, circle_maxx, circle_maxy = circle.bounds
+    if maxx < circle_minx or minx > circle_maxx or maxy < circle_miny or miny > circle_maxy:
+        return GeometryCollection()
+    inner_radius = (circle_maxx - circle_minx) / 2 * math.cos(
+        math.pi / (4 * _CLIP_CIRCLE_RESOLUTION)
+    )
+    inner_radius_sq = inner_radius * inner_radius
+    dx = max(abs(minx - center_x), abs(maxx - center_x))
+    dy = max(abs(miny - center_y), abs(maxy - center_y))
+    if dx * dx + dy * dy <= inner_radius_sq:
+        return polygon
+    offsets = shapely.get_coordinates(polygon) - (center_x, center_y)
+    if np.einsum("ij,ij->i", offsets, offsets).max() <= inner_radius_sq:
+        return polygon
+    return polygon.intersection(circle)
 
 
 def _clip_to_circle(
@@ -587,6 +610,8 @@ def _clip_to_circle(
 ) -> Polygon | MultiPolygon | GeometryCollection:
     if geometry is None or getattr(geometry, "is_empty", True):
         return GeometryCollection()
+    if shapely.contains(circle, geometry):
+        return geometry
     return geometry.intersection(circle)
 
 
@@ -596,32 +621,102 @@ def _combine_meshes(meshes: list[trimesh.Trimesh]) -> trimesh.Trimesh:
         raise ModelBuildError("Layer mesh could not be constructed.")
     if len(filtered) == 1:
         return filtered[0]
-    return trimesh.util.concatenate(filtered)
+    vertices: list[np.ndarray] = []
+    faces: list[np.ndarray] = []
+    offset = 0
+    for mesh in filtered:
+        vertices.append(mesh.vertices)
+        faces.append(mesh.faces + offset)
+        offset += len(mesh.vertices)
+    return trimesh.Trimesh(
+        vertices=np.concatenate(vertices),
+        faces=np.concatenate(faces),
+        process=False,
+    )
+
+
+def _stream_archive(
+    *,
+    formats: list[str],
+    layer_meshes: dict[str, trimesh.Trimesh],
+    metadata_json: bytes,
+    compression_level: int,
+) -> Iterator[bytes]:
+    jobs = [
+        (f"layers/{layer_name}.{fmt}", mesh, fmt)
+        for fmt in formats
+        for layer_name, mesh in layer_meshes.items()
+    ]
+    writer = ZipStreamWriter()
+    # Export and deflate entries concurrently; map() still yields them in order.
+    workers = max(min(len(jobs), os.cpu_count() or 1), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = executor.map(
+            lambda job: compress_entry(
+                job[0], _export_mesh(job[1], job[2]), compression_level
+            ),
+            jobs,
+        )
+        for entry in entries:
+            yield writer.add(entry)
+    yield writer.add(
+        compress_entry("metadata.json", metadata_json, compression_level)
+    )
+    yield writer.finish()
+
+
+_STL_HEADER = np.dtype([("header", "V80"), ("face_count", "<u4")])
+_STL_FACE = np.dtype(
+    [("normals", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
 
 
 def _export_mesh(mesh: trimesh.Trimesh, filetype: str) -> bytes:
+    if filetype == "stl":
+        return _export_binary_stl(mesh)
     payload = mesh.export(file_type=filetype)
     if isinstance(payload, str):
         return payload.encode("utf-8")
     return payload
 
 
+def _export_binary_stl(mesh: trimesh.Trimesh) -> bytes:
+    triangles = mesh.vertices[mesh.faces]
+    normals = np.cross(
+        triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    )
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    # Degenerate faces get a zero normal, matching trimesh's own exporter.
+    normals = np.divide(
+        normals, lengths, out=np.zeros_like(normals), where=lengths > trimesh.tol.zero
+    )
+
+    header = np.zeros(1, dtype=_STL_HEADER)
+    header["face_count"] = len(triangles)
+    packed = np.zeros(len(triangles), dtype=_STL_FACE)
+    packed["normals"] = normals
+    packed["vertices"] = triangles
+    return header.tobytes() + packed.tobytes()
+
+
 def _identify_home_building(
-    buildings: Iterable[BuildingFootprint], point: Point
+    buildings: list[BuildingFootprint], point: Point
 ) -> BuildingFootprint | None:
-    containing = [
-        footprint for footprint in buildings if footprint.polygon_wgs84.contains(point)
-    ]
-    if containing:
-        return containing[0]
+    if not buildings:
+        return None
+    polygons = [footprint.polygon_wgs84 for footprint in buildings]
+    containing = STRtree(polygons).query(point, predicate="within")
+    if len(containing):
+        return buildings[int(containing.min())]
 
-    def _distance(footprint: BuildingFootprint) -> float:
-        return footprint.polygon_wgs84.centroid.distance(point)
+    distances = shapely.distance(shapely.centroid(polygons), point)
+    return buildings[int(np.argmin(distances))]
 
-    try:
-        return min(buildings, key=_distance)
-    except ValueError:
-        return None
+
+def _polygon_parts(geometries) -> list[Polygon]:
+    parts = shapely.get_parts(np.asarray(geometries, dtype=object))
+    keep = (shapely.get_type_id(parts) == _POLYGON_TYPE_ID) & ~shapely.is_empty(parts)
+    return parts[keep].tolist()
 
 
 def _iter_polygons(geometry) -> list[Polygon]:
@@ -638,5 +733,77 @@ def _iter_polygons(geometry) -> list[Polygon]:
     return []
 
 
+def _extrude_polygons(
+    jobs: list[tuple[Polygon, float, float]]
+) -> list[trimesh.Trimesh]:
+    """Extrude (polygon, height, z_offset) jobs into meshes."""
+    meshes = [_extrude_polygon(polygon, height) for polygon, height, _ in jobs]
+    for mesh, (_, _, z_offset) in zip(meshes, jobs):
+        if z_offset:
+            mesh.apply_translation((0, 0, z_offset))
+    return meshes
+
+
 def _extrude_polygon(polygon: Polygon, height: float) -> trimesh.Trimesh:
-    return trimesh.creation.extrude_polygon(polygon, height, triangulation="earcut")
+    return _extrude_triangulation(_triangulate_polygon(polygon), height)
+
+
+def _triangulate_polygon(
+    polygon: Polygon,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Earcut a polygon into (2D vertices, cap triangles, ring edges)."""
+    polygon = orient(polygon, sign=1.0)
+    rings = [
+        _drop_repeated_vertices(np.asarray(ring.coords)[:-1])
+        for ring in (polygon.exterior, *polygon.interiors)
+    ]
+    if len(rings[0]) < 3:
+        no_edges = np.empty((0, 2), dtype=np.int64)
+        return np.empty((0, 2)), np.empty((0, 3), dtype=np.int64), no_edges
+    rings = [rings[0]] + [ring for ring in rings[1:] if len(ring) >= 3]
+    vertices = np.concatenate(rings)
+    ends = np.cumsum([len(ring) for ring in rings]).astype(np.uint32)
+    triangles = earcut.triangulate_float64(vertices, ends).astype(np.int64).reshape(-1, 3)
+
+    # Wind every cap triangle counter-clockwise so the top cap faces +Z.
+    corners = vertices[triangles]
+    signed = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    triangles[signed < 0] = triangles[signed < 0][:, ::-1]
+
+    starts = np.concatenate(([0], ends[:-1])).astype(np.int64)
+    following = np.arange(1, len(vertices) + 1)
+    following[ends.astype(np.int64) - 1] = starts
+    edges = np.column_stack((np.arange(len(vertices)), following))
+    return vertices, triangles, edges
+
+
+def _drop_repeated_vertices(ring: np.ndarray) -> np.ndarray:
+    # A vertex equal to its successor (wrapping around) would add a zero-length
+    # edge, whose zero-area walls break the mesh's watertightness.
+    return ring[np.any(ring != np.roll(ring, -1, axis=0), axis=1)]
+
+
+def _extrude_triangulation(
+    triangulation: tuple[np.ndarray, np.ndarray, np.ndarray], height: float
+) -> trimesh.Trimesh:
+    vertices_2d, triangles, edges = triangulation
+    if not len(triangles):
+        return trimesh.Trimesh()
+    count = len(vertices_2d)
+    vertices = np.vstack(
+        (
+            np.column_stack((vertices_2d, np.zeros(count))),
+            np.column_stack((vertices_2d, np.full(count, height))),
+        )
+    )
+    # Exterior rings are CCW and holes CW, so (a, b, b') walls face outward.
+    start, end = edges[:, 0], edges[:, 1]
+    faces = np.concatenate(
+        (
+            triangles[:, ::-1],
+            triangles + count,
+            np.column_stack((start, end, end + count)),
+            np.column_stack((start, end + count, start + count)),
+        )
+    )
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
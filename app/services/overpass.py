@@ -1,25 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import math
 import re
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Iterable
 
 import httpx
+import numpy as np
+import orjson
+import shapely
 from pyproj import Transformer
-from shapely.geometry import (
-    GeometryCollection,
-    LineString,
-    MultiPolygon,
-    Point,
-    Polygon,
-)
-from shapely.validation import make_valid
+from shapely.geometry import LineString, Point, Polygon
+from shapely.strtree import STRtree
 
 from ..config import get_settings
 
 _transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
 _inverse_transformer = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
+_transform = _transformer.transform
+_NUMBER_RE = re.compile(r"-?[0-9]+(?:\.[0-9]+)?")
 
 
 @dataclass
@@ -67,7 +70,11 @@ class OverpassError(Exception):
 
 
 async def fetch_environment(
-    latitude: float, longitude: float, radius_m: int
+    latitude: float,
+    longitude: float,
+    radius_m: int,
+    *,
+    client: httpx.AsyncClient,
 ) -> tuple[
     list[BuildingFootprint],
     list[RoadFeature],
@@ -77,63 +84,116 @@ async def fetch_environment(
     settings = get_settings()
     center_x, center_y = _project((longitude, latitude))
     tiles = _build_tiles(longitude, latitude, radius_m, settings.overpass_tile_size_m)
-    footprints: dict[int, BuildingFootprint] = {}
-    roads: dict[int, RoadFeature] = {}
-    parks: dict[int, ParkFeature] = {}
-    waters: dict[int, WaterFeature] = {}
-    async with httpx.AsyncClient(
-        headers={"User-Agent": settings.user_agent},
-        timeout=settings.overpass_timeout + 30,
-    ) as client:
-        for south, west, north, east in tiles:
-            overpass_query = _bbox_query(south, west, north, east, settings.overpass_timeout)
-            payload = await _execute_overpass(client, overpass_query, settings)
-            parsed_buildings, parsed_roads, parsed_parks, parsed_waters = _parse_payload(
-                payload
+    semaphore = asyncio.Semaphore(settings.overpass_concurrency)
+
+    seen_ids: set[int] = set()
+    parsed = [asyncio.Event() for _ in tiles]
+
+    async def _fetch_tile(
+        index: int, south: float, west: float, north: float, east: float
+    ):
+        try:
+            query = _bbox_query(south, west, north, east, settings.overpass_timeout)
+            async with semaphore:
+                payload = await _execute_overpass(client, query, settings)
+            # Parse off the event loop so it overlaps with the remaining
+            # downloads, but in tile order so the first tile to list a way is
+            # the one that builds it and later copies are skipped.
+            if index:
+                await parsed[index - 1].wait()
+            return await asyncio.to_thread(
+                _parse_payload, payload, settings, seen_ids
             )
-            for footprint in parsed_buildings:
-                footprints.setdefault(footprint.osm_id, footprint)
-            for road in parsed_roads:
-                roads.setdefault(road.osm_id, road)
-            for park in parsed_parks:
-                parks.setdefault(park.osm_id, park)
-            for water in parsed_waters:
-                waters.setdefault(water.osm_id, water)
+        finally:
+            parsed[index].set()
+
+    # One task per tile, bounded by the semaphore. The first failure cancels
+    # the outstanding tiles so a 429 stops further load upstream.
+    tasks = [
+        asyncio.ensure_future(_fetch_tile(index, *tile))
+        for index, tile in enumerate(tiles)
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    footprints, roads, parks, waters = (
+        _first_seen(chain.from_iterable(result[category] for result in results))
+        for category in range(4)
+    )
 
     if not footprints:
         return [], [], [], []
 
     circle = Point(center_x, center_y).buffer(radius_m)
-    filtered_buildings = [
-        footprint
-        for footprint in footprints.values()
-        if footprint.polygon_projected.intersects(circle)
-    ]
-    filtered_buildings.sort(key=lambda footprint: footprint.area_m2, reverse=True)
+    shapely.prepare(circle)
+    filtered_buildings = _intersecting(
+        list(footprints.values()),
+        [footprint.polygon_projected for footprint in footprints.values()],
+        circle,
+    )
+    areas = shapely.area(
+        [footprint.polygon_projected for footprint in filtered_buildings]
+    ).tolist()
+    largest = heapq.nlargest(
+        settings.max_buildings, range(len(areas)), key=areas.__getitem__
+    )
+    filtered_buildings = [filtered_buildings[index] for index in largest]
 
-    filtered_roads = [
-        road
-        for road in roads.values()
-        if road.line_projected.intersects(circle)
-    ]
-    filtered_parks = [
-        park
-        for park in parks.values()
-        if park.polygon_projected.intersects(circle)
-    ]
-    filtered_waters = [
-        water
-        for water in waters.values()
-        if water.polygon_projected.intersects(circle)
-    ]
+    filtered_roads = _intersecting(
+        list(roads.values()), [road.line_projected for road in roads.values()], circle
+    )
+    filtered_parks = _intersecting(
+        list(parks.values()),
+        [park.polygon_projected for park in parks.values()],
+        circle,
+    )
+    filtered_waters = _intersecting(
+        list(waters.values()),
+        [water.polygon_projected for water in waters.values()],
+        circle,
+    )
     return (
-        filtered_buildings[: settings.max_buildings],
+        filtered_buildings,
         filtered_roads,
         filtered_parks,
         filtered_waters,
     )
 
 
+def _first_seen(features: Iterable[Any]) -> dict[int, Any]:
+    unique: dict[int, Any] = {}
+    setdefault = unique.setdefault
+    for feature in features:
+        setdefault(feature.osm_id, feature)
+    return unique
+
+
+_STRTREE_MIN_GEOMETRIES = 32
+_POLYGON_TYPE_ID = 3
+
+
+def _intersecting(features: list, geometries: list, area: Polygon) -> list:
+    if len(geometries) < _STRTREE_MIN_GEOMETRIES:
+        candidates = np.asarray(geometries, dtype=object)
+        # Cheap envelope overlap first; only survivors pay for the exact test.
+        min_x, min_y, max_x, max_y = area.bounds
+        bounds = shapely.bounds(candidates)
+        indices = np.flatnonzero(
+            (bounds[:, 2] >= min_x)
+            & (bounds[:, 0] <= max_x)
+            & (bounds[:, 3] >= min_y)
+            & (bounds[:, 1] <= max_y)
+        )
+        hits = indices[shapely.intersects(area, candidates[indices])]
+        return [features[index] for index in hits.tolist()]
+    hits = STRtree(geometries).query(area, predicate="intersects")
+    return [features[index] for index in sorted(hits.tolist())]
+
+
 def _bbox_query(south: float, west: float, north: float, east: float, timeout: int) -> str:
     return f"""
         [out:json][timeout:{timeout}];
@@ -159,9 +219,13 @@ async def _execute_overpass(
 ) -> dict[str, Any]:
     for attempt in range(settings.overpass_retries):
         try:
-            response = await client.post(settings.overpass_url, data={"data": query})
+            response = await client.post(
+                settings.overpass_url,
+                data={"data": query},
+                timeout=settings.overpass_timeout + 30,
+            )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as exc:
             status = exc.response.status_code
             if status in (429, 504) and attempt < settings.overpass_retries - 1:
@@ -186,7 +250,7 @@ async def _execute_overpass(
 
 
 def _parse_payload(
-    payload: dict[str, Any]
+    payload: dict[str, Any], settings, seen_ids: set[int] | None = None
 ) -> tuple[
     Iterable[BuildingFootprint],
     Iterable[RoadFeature],
@@ -194,119 +258,213 @@ def _parse_payload(
     Iterable[WaterFeature],
 ]:
     elements = payload.get("elements", [])
-    node_index: dict[int, tuple[float, float]] = {
-        element["id"]: (element["lon"], element["lat"])
-        for element in elements
-        if element.get("type") == "node"
+    # Node coordinates live in one contiguous (N, 2) array; ways refer to
+    # them by row rather than through per-node Python tuples.
+    nodes = [element for element in elements if element.get("type") == "node"]
+    node_rows = {node["id"]: row for row, node in enumerate(nodes)}
+    lonlat_xy = np.fromiter(
+        chain.from_iterable((node["lon"], node["lat"]) for node in nodes),
+        dtype=np.float64,
+        count=2 * len(nodes),
+    ).reshape(-1, 2)
+    projected_xy = _project_nodes(lonlat_xy)
+
+    # Sort ways into categories first so each category's geometries can be
+    # built with one vectorised shapely call instead of one call per way.
+    ways: dict[str, tuple[list[dict[str, Any]], list[list[int]]]] = {
+        category: ([], []) for category in ("building", "park", "water", "highway")
     }
-
-    buildings: list[BuildingFootprint] = []
-    roads: list[RoadFeature] = []
-    parks: list[ParkFeature] = []
-    waters: list[WaterFeature] = []
+    if seen_ids is None:
+        seen_ids = set()
     for element in elements:
-        if element.get("type") != "way":
+        if element.get("type") != "way" or element["id"] in seen_ids:
             continue
-        node_ids = element.get("nodes", [])
-        coords = [_lonlat_from_node(node_index, node_id) for node_id in node_ids]
-        coords = [coord for coord in coords if coord]
-        if len(coords) < 3:
+        seen_ids.add(element["id"])
+        rows = [
+            node_rows[node_id]
+            for node_id in element.get("nodes", [])
+            if node_id in node_rows
+        ]
+        if len(rows) < 3:
             continue
         tags = element.get("tags", {}) or {}
         if "building" in tags:
-            building_coords = coords[:]
-            if building_coords[0] != building_coords[-1]:
-                building_coords.append(building_coords[0])
-            polygon_wgs84 = _build_polygon(building_coords, tolerance=1e-6)
-            if polygon_wgs84 is None:
-                continue
-            projected_coords = [_project(coord) for coord in building_coords]
-            polygon_projected = _build_polygon(projected_coords, tolerance=0.05)
-            if polygon_projected is None:
-                continue
-            height = _resolve_height(tags)
-            buildings.append(
-                BuildingFootprint(
-                    osm_id=element["id"],
-                    polygon_projected=polygon_projected,
-                    polygon_wgs84=polygon_wgs84,
-                    height_m=height,
-                    name=tags.get("name"),
-                    tags=tags,
-                )
-            )
+            category = "building"
         elif _is_park(tags):
-            if coords[0] != coords[-1]:
-                coords.append(coords[0])
-            projected_coords = [_project(coord) for coord in coords]
-            polygon_projected = _build_polygon(projected_coords, tolerance=0.25)
-            if polygon_projected is None:
-                continue
-            parks.append(
-                ParkFeature(
-                    osm_id=element["id"],
-                    polygon_projected=polygon_projected,
-                    tags=tags,
-                )
-            )
+            category = "park"
         elif _is_water(tags):
-            if coords[0] != coords[-1]:
-                coords.append(coords[0])
-            projected_coords = [_project(coord) for coord in coords]
-            polygon_projected = _build_polygon(projected_coords, tolerance=0.25)
-            if polygon_projected is None:
-                continue
-            waters.append(
-                WaterFeature(
-                    osm_id=element["id"],
-                    polygon_projected=polygon_projected,
-                    tags=tags,
-                )
-            )
+            category = "water"
         elif "highway" in tags:
-            projected_coords = [_project(coord) for coord in coords]
-            line_projected = _build_linestring(projected_coords, tolerance=0.25)
-            if line_projected is None:
-                continue
-            roads.append(
-                RoadFeature(
-                    osm_id=element["id"],
-                    line_projected=line_projected,
-                    tags=tags,
-                )
+            category = "highway"
+        else:
+            continue
+        if category != "highway" and not _same_node_position(lonlat_xy, rows):
+            rows.append(rows[0])
+        ways[category][0].append(element)
+        ways[category][1].append(rows)
+
+    building_elements, building_rings = ways["building"]
+    park_elements, park_rings = ways["park"]
+    water_elements, water_rings = ways["water"]
+    # One repair/simplify pass covers every ring in the payload.
+    wgs84_polygons, building_polygons, park_polygons, water_polygons = (
+        _build_polygons(
+            [
+                (lonlat_xy, building_rings, 1e-6),
+                (projected_xy, building_rings, 0.05),
+                (projected_xy, park_rings, 0.25),
+                (projected_xy, water_rings, 0.25),
+            ]
+        )
+    )
+
+    buildings: list[BuildingFootprint] = []
+    for element, polygon_wgs84, polygon_projected in zip(
+        building_elements, wgs84_polygons, building_polygons
+    ):
+        if polygon_wgs84 is None or polygon_projected is None:
+            continue
+        tags = element.get("tags", {}) or {}
+        buildings.append(
+            BuildingFootprint(
+                osm_id=element["id"],
+                polygon_projected=polygon_projected,
+                polygon_wgs84=polygon_wgs84,
+                height_m=_resolve_height(tags, settings),
+                name=tags.get("name"),
+                tags=tags,
             )
+        )
+
+    parks = [
+        ParkFeature(
+            osm_id=element["id"],
+            polygon_projected=polygon_projected,
+            tags=element.get("tags", {}) or {},
+        )
+        for element, polygon_projected in zip(park_elements, park_polygons)
+        if polygon_projected is not None
+    ]
+
+    waters = [
+        WaterFeature(
+            osm_id=element["id"],
+            polygon_projected=polygon_projected,
+            tags=element.get("tags", {}) or {},
+        )
+        for element, polygon_projected in zip(water_elements, water_polygons)
+        if polygon_projected is not None
+    ]
+
+    road_elements, road_paths = ways["highway"]
+    roads = [
+        RoadFeature(
+            osm_id=element["id"],
+            line_projected=line_projected,
+            tags=element.get("tags", {}) or {},
+        )
+        for element, line_projected in zip(
+            road_elements, _build_linestrings(projected_xy, road_paths, tolerance=0.25)
+        )
+        if line_projected is not None
+    ]
     return buildings, roads, parks, waters
 
 
-def _build_polygon(
-    coords: list[tuple[float, float]], *, tolerance: float | None = None
-) -> Polygon | None:
-    polygon = Polygon(coords)
-    if not polygon.is_valid:
-        polygon = make_valid(polygon)
-    if polygon.is_empty or not polygon.is_valid:
-        polygon = polygon.buffer(0)
-    if polygon.is_empty:
-        return None
-    if tolerance:
-        polygon = polygon.simplify(tolerance, preserve_topology=True)
-    return polygon
+def _same_node_position(xy: np.ndarray, rows: list[int]) -> bool:
+    first, last = rows[0], rows[-1]
+    return first == last or bool((xy[first] == xy[last]).all())
 
 
-def _build_linestring(
-    coords: list[tuple[float, float]], *, tolerance: float | None = None
-) -> LineString | None:
-    line = LineString(coords)
-    if line.is_empty or not line.is_valid or line.length == 0:
-        return None
+def _gather_rows(
+    xy: np.ndarray, paths: list[list[int]]
+) -> tuple[np.ndarray, np.ndarray]:
+    rows = np.fromiter(chain.from_iterable(paths), dtype=np.intp)
+    indices = np.repeat(np.arange(len(paths)), [len(path) for path in paths])
+    return xy[rows], indices
+
+
+def _build_polygons(
+    groups: list[tuple[np.ndarray, list[list[int]], float]]
+) -> list[list[Polygon | None]]:
+    results: list[list[Polygon | None]] = [
+        [None] * len(rings) for _, rings, _ in groups
+    ]
+    coords_parts: list[np.ndarray] = []
+    index_parts: list[np.ndarray] = []
+    tolerances: list[float] = []
+    slots: list[tuple[int, int]] = []
+    for group, (xy, rings, tolerance) in enumerate(groups):
+        # A closed ring needs four coordinates; shorter ways cannot form a polygon.
+        usable = [index for index, ring in enumerate(rings) if len(ring) >= 4]
+        if not usable:
+            continue
+        coords, indices = _gather_rows(xy, [rings[index] for index in usable])
+        coords_parts.append(coords)
+        index_parts.append(indices + len(slots))
+        tolerances.extend([tolerance] * len(usable))
+        slots.extend((group, index) for index in usable)
+    if not slots:
+        return results
+
+    polygons = shapely.polygons(
+        shapely.linearrings(
+            np.concatenate(coords_parts), indices=np.concatenate(index_parts)
+        )
+    )
+    # Most OSM rings are already valid; only repair the ones that are not.
+    # make_valid always returns a valid geometry, so no buffer(0) pass follows.
+    invalid = ~shapely.is_valid(polygons)
+    if invalid.any():
+        polygons[invalid] = [
+            _largest_polygon(geometry)
+            for geometry in shapely.make_valid(polygons[invalid]).tolist()
+        ]
+    empty = shapely.is_empty(polygons)
+    polygons = shapely.simplify(
+        polygons, np.asarray(tolerances), preserve_topology=True
+    )
+
+    for (group, index), polygon, is_empty in zip(
+        slots, polygons.tolist(), empty.tolist()
+    ):
+        if not is_empty:
+            results[group][index] = polygon
+    return results
+
+
+def _largest_polygon(geometry) -> Polygon:
+    if isinstance(geometry, Polygon):
+        return geometry
+    # make_valid may nest multi-part geometries inside a collection.
+    parts = shapely.get_parts(shapely.get_parts(geometry))
+    polygons = parts[shapely.get_type_id(parts) == _POLYGON_TYPE_ID]
+    if not len(polygons):
+        return Polygon()
+    return polygons[np.argmax(shapely.area(polygons))]
+
+
+def _build_linestrings(
+    xy: np.ndarray, paths: list[list[int]], *, tolerance: float | None = None
+) -> list[LineString | None]:
+    if not paths:
+        return []
+    coords, indices = _gather_rows(xy, paths)
+    lines = shapely.linestrings(coords, indices=indices)
+    keep = (
+        ~shapely.is_empty(lines) & shapely.is_valid(lines) & (shapely.length(lines) > 0)
+    )
     if tolerance:
-        line = line.simplify(tolerance, preserve_topology=True)
-    return line
+        lines = shapely.simplify(lines, tolerance, preserve_topology=True)
+    return [
+        line if kept else None for line, kept in zip(lines.tolist(), keep.tolist())
+    ]
 
 
+@lru_cache(maxsize=4096)
 def _project(coord: tuple[float, float]) -> tuple[float, float]:
     lon, lat = coord
-    x, y = _transformer.transform(lon, lat)
+    x, y = _transform(lon, lat)
     return (float(x), float(y))
 
 
@@ -314,19 +472,14 @@ def project_point(lon: float, lat: float) -> tuple[float, float]:
     return _project((lon, lat))
 
 
-def _inverse_project(x: float, y: float) -> tuple[float, float]:
-    lon, lat = _inverse_transformer.transform(x, y)
-    return (float(lon), float(lat))
-
+def _project_nodes(lonlats: np.ndarray) -> np.ndarray:
+    if not len(lonlats):
+        return np.empty((0, 2), dtype=np.float64)
+    xs, ys = _transformer.transform(lonlats[:, 0], lonlats[:, 1])
+    return np.column_stack((xs, ys))
 
-def _lonlat_from_node(
-    node_index: dict[int, tuple[float, float]], node_id: int
-) -> tuple[float, float] | None:
-    return node_index.get(node_id)
 
-
-def _resolve_height(tags: dict[str, Any]) -> float:
-    settings = get_settings()
+def _resolve_height(tags: dict[str, Any], settings) -> float:
     height = _parse_float(tags.get("height"))
     if height:
         return max(settings.min_height_m, float(height))
@@ -342,14 +495,22 @@ def _parse_float(value: Any) -> float | None:
     if value is None:
         return None
     if isinstance(value, (int, float)):
-        return float(value)
-    match = re.search(r"([0-9]+(?:\\.[0-9]+)?)", str(value))
-    if match:
+        number = float(value)
+    else:
+        # Most tags are plain numbers such as "12.5"; only fall back to
+        # scanning for a number when they carry units or text ("12.5 m").
         try:
-            return float(match.group(1))
+            number = float(value)
         except ValueError:
-            return None
-    return None
+            match = _NUMBER_RE.search(str(value))
+            if not match:
+                return None
+            number = float(match.group())
+    # Negative or non-finite values are bad data: return None so callers
+    # fall back to building:levels or the default height.
+    if not math.isfinite(number) or number < 0:
+        return None
+    return number
 
 
 def _is_park(tags: dict[str, Any]) -> bool:
@@ -380,23 +541,24 @@ def _build_tiles(
     min_y = center_y - radius_m
     max_y = center_y + radius_m
 
-    tiles: list[tuple[float, float, float, float]] = []
-    y = min_y
-    while y < max_y:
-        next_y = min(y + tile_size_m, max_y)
-        x = min_x
-        while x < max_x:
-            next_x = min(x + tile_size_m, max_x)
-            west, south = _inverse_project(x, y)
-            east, north = _inverse_project(next_x, next_y)
-            tiles.append(
-                (
-                    min(south, north),
-                    min(west, east),
-                    max(south, north),
-                    max(west, east),
-                )
-            )
-            x = next_x
-        y = next_y
-    return tiles
+    # Split the square evenly instead of stepping by exactly tile_size_m, which
+    # left thin remainder strips that each cost a full round of queries. Tiles
+    # never exceed tile_size_m; a radius that fits in one tile gets one bbox.
+    count = max(1, math.ceil(2 * radius_m / tile_size_m))
+    xs = np.linspace(min_x, max_x, count + 1).tolist()
+    ys = np.linspace(min_y, max_y, count + 1).tolist()
+    boxes = [
+        (xs[col], ys[row], xs[col + 1], ys[row + 1])
+        for row in range(count)
+        for col in range(count)
+    ]
+
+    corners = np.array(boxes, dtype=np.float64)
+    wests, souths = _inverse_transformer.transform(corners[:, 0], corners[:, 1])
+    easts, norths = _inverse_transformer.transform(corners[:, 2], corners[:, 3])
+    return [
+        (min(south, north), min(west, east), max(south, north), max(west, east))
+        for west, south, east, north in zip(
+            wests.tolist(), souths.tolist(), easts.tolist(), norths.tolist()
+        )
+    ]
@@ -72,12 +72,16 @@ async function handleSearch() {
     pushLog('Enter an address to search.');
     return;
   }
+  if (query.length < 2 || query.length > 200) {
+    pushLog('Search text must be between 2 and 200 characters.');
+    return;
+  }
   toggleBusy(true);
   try {
     const response = await fetch(`/api/geocode?query=${encodeURIComponent(query)}`);
     if (!response.ok) {
       const err = await response.json().catch(() => ({ detail: 'Nothing found for that search.' }));
-      throw new Error(err.detail || 'Nothing found for that search.');
+      throw new Error(errorDetail(err, 'Nothing found for that search.'));
     }
     const data = await response.json();
     populateResults(data.results || []);
@@ -142,7 +146,7 @@ async function handleGenerate() {
     });
     if (!response.ok) {
       const err = await response.json().catch(() => ({ detail: 'Server error' }));
-      throw new Error(err.detail || 'Model failed');
+      throw new Error(errorDetail(err, 'Model failed'));
     }
     const blob = await response.blob();
     const url = window.URL.createObjectURL(blob);
@@ -173,7 +177,7 @@ async function handlePreview() {
     });
     if (!response.ok) {
       const err = await response.json().catch(() => ({ detail: 'Preview unavailable' }));
-      throw new Error(err.detail || 'Preview failed');
+      throw new Error(errorDetail(err, 'Preview failed'));
     }
     const data = await response.json();
     renderPreview(data);
@@ -253,12 +257,7 @@ function drawPaths(ctx, paths, color) {
 
   paths.forEach((path) => {
     ctx.beginPath();
-    path.outer.forEach(([nx, ny], idx) => {
-      const x = nx * ctx.canvas.width;
-      const y = ny * ctx.canvas.height;
-      if (idx === 0) ctx.moveTo(x, y);
-      else ctx.lineTo(x, y);
-    });
+    traceRing(ctx, path.outer);
     ctx.closePath();
     ctx.fill();
 
@@ -267,12 +266,7 @@ function drawPaths(ctx, paths, color) {
       ctx.fillStyle = '#ffffff';
       path.holes.forEach((hole) => {
         ctx.beginPath();
-        hole.forEach(([nx, ny], idx) => {
-          const x = nx * ctx.canvas.width;
-          const y = ny * ctx.canvas.height;
-          if (idx === 0) ctx.moveTo(x, y);
-          else ctx.lineTo(x, y);
-        });
+        traceRing(ctx, hole);
         ctx.closePath();
         ctx.fill();
       });
@@ -283,6 +277,25 @@ function drawPaths(ctx, paths, color) {
   ctx.restore();
 }
 
+// Rings arrive as flat [x0, y0, x1, y1, ...] arrays of normalized coordinates.
+function traceRing(ctx, ring) {
+  for (let i = 0; i + 1 < ring.length; i += 2) {
+    const x = ring[i] * ctx.canvas.width;
+    const y = ring[i + 1] * ctx.canvas.height;
+    if (i === 0) ctx.moveTo(x, y);
+    else ctx.lineTo(x, y);
+  }
+}
+
+function errorDetail(err, fallback) {
+  // Validation errors (422) carry a list of {msg, ...} objects, not a string.
+  if (Array.isArray(err.detail)) {
+    const messages = err.detail.map((item) => item && item.msg).filter(Boolean);
+    return messages.length ? messages.join('; ') : fallback;
+  }
+  return typeof err.detail === 'string' && err.detail ? err.detail : fallback;
+}
+
 function pushLog(message) {
   const timestamp = new Date().toLocaleTimeString();
   const entry = document.createElement('div');